@@ -11,6 +11,24 @@ import matplotlib.patches
 from PyQt5 import QtWidgets, QtCore
 matplotlib.use('Qt5Agg')
 
+# q_table_state 的分界:
+# 前方距離 >= FAR_DIST 為 far，>= MIDDLE_DIST 為 middle，其餘為 close
+# 右減左 > SIDE_DIFF 為 right(右側有空間)，< -SIDE_DIFF 為 left，其餘為 center
+FAR_DIST = 9.5
+MIDDLE_DIST = 5
+SIDE_DIFF = 2.5
+FRONT_LEVELS = ("close", "middle", "far")
+SIDE_LEVELS = ("left", "center", "right")
+
+
+# 感測器 (front, right, left) -> (FRONT_LEVELS 的索引, SIDE_LEVELS 的索引)
+def sensor_levels(car_state):
+    f_dist, r_dist, l_dist = car_state
+    rl_dif = r_dist - l_dist
+    front = 2 if f_dist >= FAR_DIST else (1 if f_dist >= MIDDLE_DIST else 0)
+    side = 2 if rl_dif > SIDE_DIFF else (0 if rl_dif < -SIDE_DIFF else 1)
+    return front, side
+
 
 class Car():
     def __init__(self) -> None:
@@ -29,12 +47,13 @@ class Car():
         return self.diameter/2
 
     # reset the car to the beginning line
-    def reset(self):
+    # rng: 決定起始 x 的亂數產生器(例如 random.Random(seed))，預設用全域的 random
+    def reset(self, rng=r):
         self.angle = 90
         self.wheel_angle = 0
         xini_range = (self.xini_max - self.xini_min - self.diameter)
         left_xpos = self.xini_min + self.diameter//2
-        self.xpos = r.random()*xini_range + left_xpos  # random x pos [-3, 3]
+        self.xpos = rng.random()*xini_range + left_xpos  # random x pos [-3, 3]
         self.ypos = 0
 
     def setWheelAngle(self, angle):
@@ -90,10 +109,38 @@ class Car():
         self.setAngle(new_angle)
 
 class Playground():
-    def __init__(self):
+    '''
+    update_mode: Q-table 更新方式
+        "td": 只在回合結束時做一次 TD 更新(原本的做法)
+        "lambda": 回合結束時以 Q(lambda) 的 lambda-return 更新整條軌跡
+        "mc": 回合結束時以 Monte Carlo 折扣回報更新整條軌跡
+    alpha, gamma: 學習率與折扣因子，None 時依模式使用預設值
+        (td: 1, 1，同原本的 update_q_table；lambda/mc: 0.1, 0.95)
+    trace_lambda: lambda 模式的衰減係數
+    track_file: 軌道檔案(格式同 軌道座標點.txt)，None 時使用預設軌道；
+                讀取失敗時直接丟出錯誤，不會改用預設軌道
+    verbose: 是否在每回合結束時印出 reward、Q-table 與模擬結果
+    autosave: 抵達終點時是否自動存檔(td 的 update_q_table 與 run_simulation)
+    '''
+    update_modes = ("td", "lambda", "mc")
+
+    def __init__(self, update_mode="td", alpha=None, gamma=None, trace_lambda=0.8,
+                 track_file=None, verbose=True, autosave=True):
+        if update_mode not in self.update_modes:
+            raise ValueError(f"Unknown update mode: {update_mode}")
+        self.update_mode = update_mode
+        td = update_mode == "td"
+        self.alpha = alpha if alpha is not None else (1 if td else 0.1)  # 學習率
+        self.gamma = gamma if gamma is not None else (1 if td else 0.95)  # 折扣因子
+        self.trace_lambda = trace_lambda  # eligibility trace 的衰減係數
+        self.verbose = verbose
+        self.autosave = autosave
         # read path lines
         self.path_line_filename = "軌道座標點.txt"
         self._setDefaultLine()
+        if track_file:
+            self.path_line_filename = track_file
+            self._readPathLines(fallback=False)
         self.decorate_lines = [
             Line2D(-6, 0, 6, 0),  # start line
             Line2D(0, 0, 0, -3),  # middle line
@@ -117,16 +164,27 @@ class Playground():
                 "far_center": np.zeros(7),
                 "far_right": np.zeros(7),
         }
+        self.state_keys = list(self.q_table)
+        self.state_index = {k: i for i, k in enumerate(self.state_keys)}
         self.car = Car()
         self.reset()
         self.cumulated_reward = 0
         self.error_count = 0
+
+        # 記錄一回合的軌跡(預先配置，不夠時再加倍)
+        self.episode_capacity = 1024
+        self.episode_states = np.zeros(self.episode_capacity, dtype=np.intp)
+        self.episode_actions = np.zeros(self.episode_capacity, dtype=np.intp)
+        self.episode_rewards = np.zeros(self.episode_capacity)
+        self.episode_next_states = np.zeros(self.episode_capacity, dtype=np.intp)
+        self.episode_length = 0
     
     def load_q_table(self):
         """加載已保存的 Q-table"""
         if os.path.exists(self.q_table_path):
             self.q_table = np.load(self.q_table_path, allow_pickle=True).item()
-            print("Loaded Q-table from file.")
+            if self.verbose:
+                print("Loaded Q-table from file.")
         else:
             # 初始化 Q-table
             self.q_table = {
@@ -160,9 +218,11 @@ class Playground():
     def save_q_table(self):
         """保存 Q-table 到文件"""
         np.save(self.q_table_path, self.q_table)
-        print("Q-table saved to file.")
+        if self.verbose:
+            print("Q-table saved to file.")
 
-    def _readPathLines(self):
+    # fallback: 讀取失敗時是否改用預設軌道
+    def _readPathLines(self, fallback=True):
         try:
             with open(self.path_line_filename, 'r', encoding='utf-8') as f:
                 lines = f.readlines()
@@ -185,6 +245,8 @@ class Playground():
                     inip = p
                     self.lines.append(line)
         except Exception:
+            if not fallback:
+                raise
             self._setDefaultLine()
 
     @property
@@ -227,25 +289,15 @@ class Playground():
         right_intersections, find_right_inter = [], True
         left_intersections, find_left_inter = [], True
         for wall in self.lines:  # check every line in play ground
-            dToLine = cpos.distToLine2D(wall)
             p1, p2 = wall.p1, wall.p2
-            dp1, dp2 = (cpos-p1).length, (cpos-p2).length
-            wall_len = wall.length
-
-            # touch conditions
-            p1_touch = (dp1 < radius)
-            p2_touch = (dp2 < radius)
-            body_touch = (
-                dToLine < radius and (dp1 < wall_len and dp2 < wall_len)
-            )
-            front_touch, front_t, front_u = Line2D(
-                cpos, cfront_pos).lineOverlap(wall)
+            touch, (front_touch, front_t, front_u) = self._touchWall(
+                wall, cpos, cfront_pos, radius)
             right_touch, right_t, right_u = Line2D(
                 cpos, cright_pos).lineOverlap(wall)
             left_touch, left_t, left_u = Line2D(
                 cpos, cleft_pos).lineOverlap(wall)
 
-            if p1_touch or p2_touch or body_touch or front_touch:
+            if touch:
                 if not done:
                     done = True
 
@@ -285,6 +337,34 @@ class Playground():
         self.done = done
         return done
 
+    # 車子是否碰到這道牆，同時回傳車頭線段與牆的 lineOverlap 結果
+    def _touchWall(self, wall, cpos, cfront_pos, radius):
+        dToLine = cpos.distToLine2D(wall)
+        p1, p2 = wall.p1, wall.p2
+        dp1, dp2 = (cpos-p1).length, (cpos-p2).length
+        wall_len = wall.length
+
+        # touch conditions
+        p1_touch = (dp1 < radius)
+        p2_touch = (dp2 < radius)
+        body_touch = (
+            dToLine < radius and (dp1 < wall_len and dp2 < wall_len)
+        )
+        front = Line2D(cpos, cfront_pos).lineOverlap(wall)
+        return p1_touch or p2_touch or body_touch or front[0], front
+
+    # 只檢查是否撞牆或抵達終點，不計算感測器(給 action repeat 中間的 tick 使用)
+    def _checkDone(self):
+        cpos = self.car.getPosition('center')
+        cfront_pos = self.car.getPosition('front')
+        radius = self.car.radius
+
+        if cpos.isInRect(self.destination_line.p1, self.destination_line.p2):
+            return True
+
+        return any(self._touchWall(wall, cpos, cfront_pos, radius)[0]
+                   for wall in self.lines)
+
     def _setIntersections(self, front_inters, left_inters, right_inters):
         self.front_intersects = sorted(front_inters, key=lambda p: p.distToPoint2D(
             self.car.getPosition('front')))
@@ -293,16 +373,17 @@ class Playground():
         self.left_intersects = sorted(left_inters, key=lambda p: p.distToPoint2D(
             self.car.getPosition('left')))
 
-    def reset(self):
+    def reset(self, rng=r):
         self.done = False
         self.complete = False
-        self.car.reset()
+        self.car.reset(rng)
 
         if self.car_init_angle and self.car_init_pos:
             self.setCarPosAndAngle(self.car_init_pos, self.car_init_angle)
         
         self._checkDoneIntersects()
         self.cumulative_reward = 0
+        self.episode_length = 0
         return self.state
 
     def setCarPosAndAngle(self, position: Point2D = None, angle=None):
@@ -317,12 +398,18 @@ class Playground():
         return action_table[action]
 
 
-    def step(self, action=None):
+    # repeat: 同一個輪胎角度連續走幾個 tick，只有最後一個 tick(或結束時)才計算感測器
+    def step(self, action=None, repeat=1):
+        if repeat < 1:
+            raise ValueError(f"repeat must be at least 1, got {repeat}")
         if action:
             self.car.setWheelAngle(action)
 
         if not self.done:
-            self.car.tick()
+            for i in range(repeat):
+                self.car.tick()
+                if i == repeat - 1 or self._checkDone():
+                    break
             self._checkDoneIntersects()
             return self.state
         else:
@@ -330,29 +417,12 @@ class Playground():
 
     # relationship function(設定state)
     def q_table_state(self, car_state):
-        f_dist, r_dist, l_dist = car_state
-        rl_dif = r_dist-l_dist
-
-        q_state = ""
-        if f_dist >= 9.5:
-            q_state += "far_"
-        elif f_dist >= 5:
-            q_state += "middle_"
-        else:
-            q_state += "close_"
-
         '''
         right表示右側有空間
         left 表示左側有空間
         '''
-        if rl_dif > 2.5:
-            q_state += "right"
-        elif -2.5 <= rl_dif <= 2.5:
-            q_state += "center"
-        elif rl_dif < -2.5:
-            q_state += "left"
-
-        return q_state
+        front, side = sensor_levels(car_state)
+        return f"{FRONT_LEVELS[front]}_{SIDE_LEVELS[side]}"
 
 
     # reward function(調整後最佳的方法)
@@ -377,13 +447,70 @@ class Playground():
             self.q_table[previous_state][self.angle_to_index(previous_angle)] \
                 += + a * (self.reward(current_state, current_angle) + r * max(self.q_table[current_state]) -
                             self.q_table[previous_state][self.angle_to_index(previous_angle)])
-            print(f"Cumulated Reward and Reward: {self.cumulated_reward},{reward}")
-            print("Updated Q-Table:", self.q_table)
-            if self.complete:
+            if self.verbose:
+                print(f"Cumulated Reward and Reward: {self.cumulated_reward},{reward}")
+                print("Updated Q-Table:", self.q_table)
+            if self.complete and self.autosave:
                 self.save_q_table()
 
+    # 記錄一步的 (state, action, reward, next state)
+    def record_transition(self, current_state, current_angle, previous_state, previous_angle):
+        if self.episode_length == self.episode_capacity:
+            self.episode_capacity *= 2
+            self.episode_states.resize(self.episode_capacity, refcheck=False)
+            self.episode_actions.resize(self.episode_capacity, refcheck=False)
+            self.episode_rewards.resize(self.episode_capacity, refcheck=False)
+            self.episode_next_states.resize(self.episode_capacity, refcheck=False)
+
+        reward = self.reward(current_state, current_angle)
+        self.cumulated_reward += reward
+        i = self.episode_length
+        self.episode_states[i] = self.state_index[previous_state]
+        self.episode_actions[i] = self.angle_to_index(previous_angle)
+        self.episode_rewards[i] = reward
+        self.episode_next_states[i] = self.state_index[current_state]
+        self.episode_length += 1
+
+    # 回合結束時，一次把整條軌跡的更新套用到 Q-table
+    def episode_backup(self):
+        n = self.episode_length
+        if n == 0:
+            return
+        table = np.stack([self.q_table[k] for k in self.state_keys])
+        states = self.episode_states[:n]
+        actions = self.episode_actions[:n]
+        rewards = self.episode_rewards[:n]
+
+        # mc: G_t = r_t + gamma * G_{t+1}
+        # lambda: G_t = r_t + gamma * ((1 - lambda) * max Q(s_{t+1}) + lambda * G_{t+1})
+        trace = 1.0 if self.update_mode == "mc" else self.trace_lambda
+        next_values = table[self.episode_next_states[:n]].max(axis=1)
+        next_values[-1] = 0  # 終止狀態沒有後續價值
+        targets = rewards + self.gamma * (1 - trace) * next_values
+        # 回報由後往前逐步累加(O(n) 的迴圈)，避免 discount 次方在長回合下溢位
+        returns = np.empty(n)
+        g = 0.0
+        for t in range(n - 1, -1, -1):
+            g = targets[t] + self.gamma * trace * g
+            returns[t] = g
+
+        # 同一格在一回合中可能出現很多次，先取平均回報再更新，
+        # 否則等於把學習率乘上出現次數，Q 值會衝過頭
+        sums = np.zeros_like(table)
+        counts = np.zeros_like(table)
+        np.add.at(sums, (states, actions), returns)
+        np.add.at(counts, (states, actions), 1)
+        visited = counts > 0
+        table[visited] += self.alpha * (sums[visited] / counts[visited] - table[visited])
+        for k, row in zip(self.state_keys, table):
+            self.q_table[k] = row
+        self.episode_length = 0
+        if self.verbose:
+            print(f"Cumulated Reward: {self.cumulated_reward}")
+
     # turning index to wheel angle
-    def index_to_angle(self, index):
+    @staticmethod
+    def index_to_angle(index):
         action_table = [-30, -15, -10, 0, 10, 15, 30]
         return action_table[index]
     # turning wheel angle to index
@@ -405,57 +532,147 @@ class Playground():
         return r.choice(max_indices)
 
     # training model
-    def ql_train(self, training_time, e):
+    def ql_train(self, training_time, e, repeat=1):
         for i in range(training_time):
             e_train = e * m.exp(-4 *i / training_time)  # Calculate decaying epsilon，4 是 decay factor
-            self.run_simulation(e_train)  # Run a full simulation episode
+            self.run_simulation(e_train, repeat)  # Run a full simulation episode
             
             # 检查是否撞牆但未抵達終點
             if not self.complete:
                 self.error_count += 1  # 撞到牆加一
-        print(f"Training completed with {self.error_count} errors. Final epsilon: {e_train}")
+        if self.verbose:
+            print(f"Training completed with {self.error_count} errors. Final epsilon: {e_train}")
+
+    # 訓練一步(選動作、前進、更新 Q-table)，回合結束時做整條軌跡的更新
+    def train_step(self, e, repeat=1):
+        q_state = self.q_table_state(self.state)
+        action = self.e_greedy(e, q_state)
+        self.previous_state = q_state
+        self.previous_angle = action
+        self.current_state = self.q_table_state(self.step(action, repeat))
+        self.current_angle = self.car.wheel_angle
+        if self.update_mode == "td":
+            self.update_q_table(self.current_state, self.current_angle,
+                                self.previous_state, self.previous_angle,
+                                a=self.alpha, r=self.gamma)
+        else:
+            self.record_transition(self.current_state, self.current_angle,
+                                   self.previous_state, self.previous_angle)
+            if self.done:
+                self.episode_backup()
 
     # 模擬
-    def run_simulation(self, e):
+    def run_simulation(self, e, repeat=1):
         self.reset()
-        q_state = self.q_table_state(self.state)
         while not self.done:
-            action = self.e_greedy(e, q_state)
-            self.previous_state = q_state
-            self.previous_angle = action
-            self.current_state = self.q_table_state(self.step(action))
-            self.current_angle = self.car.wheel_angle
-            self.update_q_table(self.current_state, self.current_angle,
-                                    self.previous_state, self.previous_angle)
-            q_state = self.current_state
+            self.train_step(e, repeat)
         # Save the Q-table only if the simulation was successful
-        if self.complete:
+        if self.complete and self.autosave:
             self.save_q_table()
-            print("Simulation succeeded, Q-table saved.")
-        else:
+            if self.verbose:
+                print("Simulation succeeded, Q-table saved.")
+        elif self.verbose:
             print("Simulation failed, Q-table not saved.")
     
     # 點擊start的模擬
-    def run(self, e, state):
-        self.load_q_table
+    def run(self, e, state, repeat=1):
         q_state = self.q_table_state(state)
         action = self.e_greedy(0, q_state) #這邊用0是希望模型最好挑最大值
         self.previous_state = q_state
         self.previous_angle = action
-        self.current_state = self.q_table_state(self.step(action))
+        self.current_state = self.q_table_state(self.step(action, repeat))
         self.current_angle = self.car.wheel_angle
         self.update_q_table(self.current_state, self.current_angle,
-                            self.previous_state, self.previous_angle)
-        
+                            self.previous_state, self.previous_angle,
+                            a=self.alpha, r=self.gamma)
+
+    # 以凍結的策略走一步，不更新 Q-table
+    def run_policy(self, policy, repeat=1):
+        self.car.setWheelAngle(policy(self.state))
+        return self.step(None, repeat)
+
+
+class GreedyPolicy():
+    '''
+    推論用的策略: 把 Q-table 凍結成每個 q_state 對應的輪胎角度，
+    同分時以 seed 決定，之後查表不再用到亂數
+    angle_table[front][side]: front 0/1/2 = close/middle/far，
+                              side 0/1/2 = left/center/right
+    '''
+
+    def __init__(self, q_table, seed=0):
+        rng = np.random.default_rng(seed)
+        self.angle_table = []
+        for front in FRONT_LEVELS:
+            row = []
+            for side in SIDE_LEVELS:
+                values = np.asarray(q_table[f"{front}_{side}"])
+                best = np.flatnonzero(values == values.max())
+                row.append(Playground.index_to_angle(rng.choice(best)))
+            self.angle_table.append(row)
+        self.angle_array = np.array(self.angle_table)
+
+    @classmethod
+    def from_file(cls, path="q_table.npy", seed=0):
+        return cls(np.load(path, allow_pickle=True).item(), seed)
+
+    # 感測器 (front, right, left) -> 輪胎角度
+    def __call__(self, car_state):
+        front, side = sensor_levels(car_state)
+        return self.angle_table[front][side]
+
+    # 一次查很多組感測器，car_states 形狀為 (N, 3)
+    def act_batch(self, car_states):
+        car_states = np.asarray(car_states)
+        front = np.digitize(car_states[:, 0], [MIDDLE_DIST, FAR_DIST])
+        rl_dif = car_states[:, 1] - car_states[:, 2]
+        side = np.where(rl_dif > SIDE_DIFF, 2, np.where(rl_dif < -SIDE_DIFF, 0, 1))
+        return self.angle_array[front, side]
+
+    # 跑完一回合，回傳 (是否抵達終點, 步數)
+    # 起始位置由 seed 決定，相同 seed 的結果相同，也不會動到全域的 random
+    def rollout(self, play: Playground, max_steps=1000, repeat=1, seed=0):
+        play.reset(r.Random(seed))
+        steps = 0
+        while not play.done and steps < max_steps:
+            play.run_policy(self, repeat)
+            steps += 1
+        return play.complete, steps
+
+    # 同時跑多個 Playground，每一步用 act_batch 一次決定所有車子的輪胎角度
+    # 第 i 個 Playground 的起始位置由 seed + i 決定
+    def rollout_batch(self, plays, max_steps=1000, repeat=1, seed=0):
+        for i, play in enumerate(plays):
+            play.reset(r.Random(seed + i))
+        steps = [0] * len(plays)
+        active = [i for i, play in enumerate(plays) if not play.done]
+        while active:
+            angles = self.act_batch([plays[i].state for i in active])
+            for i, angle in zip(active, angles):
+                plays[i].car.setWheelAngle(angle)
+                plays[i].step(None, repeat)
+                steps[i] += 1
+            active = [i for i in active if not plays[i].done and steps[i] < max_steps]
+        return [(play.complete, n) for play, n in zip(plays, steps)]
+
+
 class Animation(QtWidgets.QMainWindow):
     '''
     state: 當前狀態
     QtCore.QTimer: 控制動畫的執行頻率和狀態
+    client: simple_server.FrameClient，有的話只顯示模擬伺服器傳來的畫面，
+            軌道也由伺服器傳來，play 可以是 None
+    playground: 觀看伺服器上第幾個 Playground
+    policy: GreedyPolicy，有的話用凍結的策略開車，不再更新 Q-table
     '''
-    def __init__(self, play: Playground):
+    def __init__(self, play: Playground, client=None, policy=None, playground=0):
         super().__init__()
         self.play = play
-        self.state = self.play.reset()
+        self.client = client
+        self.policy = policy
+        self.playground = playground
+        self.episode = None
+        self.state = self.play.reset() if self.play else None
         self.now_running = False
         self.timer = QtCore.QTimer(self)
         self.path_points = []
@@ -493,10 +710,17 @@ class Animation(QtWidgets.QMainWindow):
         text: 感測器偵測到的距離    
         '''
         self.ax = self.figure.add_subplot(111)
-        self.background = self.play.lines
-        self.start_line = self.play.decorate_lines[0]
-        self.finish_line = self.play.destination_line
-        self.car_radius = self.play.car.radius
+        if self.client:
+            destination, walls = self.client.tracks[self.playground]
+            self.background = [Line2D(*wall) for wall in walls]
+            self.start_line = Line2D(-6, 0, 6, 0)
+            self.finish_line = Line2D(*destination)
+            self.car_radius = Car().radius
+        else:
+            self.background = self.play.lines
+            self.start_line = self.play.decorate_lines[0]
+            self.finish_line = self.play.destination_line
+            self.car_radius = self.play.car.radius
         self.direction_line, = self.ax.plot([], [], 'r-')  # 指引方向的線
         self.car_path, = self.ax.plot([], [], 'g-', linewidth=2)
         self.text = self.ax.text(15, 0, '', fontsize=10)
@@ -524,7 +748,8 @@ class Animation(QtWidgets.QMainWindow):
             self.timer.stop()
 
         self.clean()
-        self.play.reset()
+        if not self.client:
+            self.play.reset()
         self.now_running = True
 
         # 更新動畫的函數
@@ -539,10 +764,13 @@ class Animation(QtWidgets.QMainWindow):
 
     # 畫面
     def update_animation(self):
+        if self.client:
+            self.update_frame()
+            return
         car_pos = self.play.car.getPosition("center")
         self.path_points.append((car_pos.x, car_pos.y))
         self.update_path()
-        self.draw_car(car_pos)
+        self.draw_car(car_pos, self.play.car.getPosition("front"))
         #更新感測器所得到的文本
         self.text.set_text(
             f'Front sensor: {self.play.state[0]:.{3}f}\n'
@@ -559,10 +787,36 @@ class Animation(QtWidgets.QMainWindow):
             self.timer.stop()
             self.now_running = False
 
-        self.play.run(0, self.play.state)# 這裡用0來挑最大值
+        if self.policy:
+            self.play.run_policy(self.policy)
+        else:
+            self.play.run(0, self.play.state)# 這裡用0來挑最大值
         # 畫出所有移動畫面
         self.canvas.draw()
 
+    # 顯示伺服器傳來的最新畫面(中間落後的畫面直接略過)
+    def update_frame(self):
+        frame = self.client.poll().get(self.playground)
+        if frame is None:
+            return
+        if frame.episode != self.episode:
+            self.episode = frame.episode
+            self.clean()
+
+        car_pos = Point2D(frame.x, frame.y)
+        front_pos = car_pos + Point2D(m.cos(frame.angle/180*m.pi),
+                                      m.sin(frame.angle/180*m.pi))*self.car_radius
+        self.path_points.append((car_pos.x, car_pos.y))
+        self.update_path()
+        self.draw_car(car_pos, front_pos)
+        self.text.set_text(
+            f'Episode: {frame.episode}\n'
+            f'Front sensor: {frame.front:.{3}f}\n'
+            f'Right sensor: {frame.right:.{3}f}\n'
+            f'Left sensor: {frame.left:.{3}f}'
+        )
+        self.canvas.draw()
+
     def update_path(self):
         if self.path_points:
             x, y = zip(*self.path_points)
@@ -575,10 +829,9 @@ class Animation(QtWidgets.QMainWindow):
         msg_box.exec_()
 
     # 畫出車子
-    def draw_car(self, car_pos):
+    def draw_car(self, car_pos, front_sensor):
         self.car = plt.Circle((car_pos.x, car_pos.y), self.car_radius, color="green", fill=False)
         self.ax.add_patch(self.car)
-        front_sensor = self.play.car.getPosition("front")
         self.direction_line.set_data([car_pos.x, front_sensor.x], [car_pos.y, front_sensor.y])
 
     # 清理過去車子移動軌跡
@@ -0,0 +1,250 @@
+import asyncio
+import argparse
+import socket
+import struct
+import time
+from collections import namedtuple
+from simple_playground import Playground
+
+
+'''
+本地模擬伺服器: 伺服器全速執行一個或多個 Playground 的訓練，
+並把每一步的車子位置與感測器數值以二進位畫面傳給所有連線的觀看端。
+觀看端跟不上時，伺服器只保留最新的畫面(丟掉舊的)，不會拖慢訓練。
+
+訊息格式(little endian):
+    軌道 TRACK_HEADER + (n_lines + 1) * 4 個 float32
+        type=0, playground id, n_lines，接著終點的兩點，再接著每道牆的兩點
+    畫面 FRAME
+        type=1, playground id, episode, step, flags(1: done, 2: complete),
+        x, y, angle, wheel angle, front, right, left
+'''
+TRACK = 0
+FRAME = 1
+TRACK_HEADER = struct.Struct('<BHI')
+FRAME_STRUCT = struct.Struct('<BHIIB7f')
+
+Frame = namedtuple('Frame', ['playground', 'episode', 'step', 'done', 'complete',
+                             'x', 'y', 'angle', 'wheel_angle', 'front', 'right', 'left'])
+
+
+def pack_track(index, play: Playground):
+    lines = [play.destination_line] + play.lines
+    values = [v for line in lines for v in (line.p1.x, line.p1.y, line.p2.x, line.p2.y)]
+    return TRACK_HEADER.pack(TRACK, index, len(play.lines)) + \
+        struct.pack(f'<{len(values)}f', *values)
+
+
+def pack_frame(index, episode, step, play: Playground):
+    flags = (1 if play.done else 0) | (2 if play.complete else 0)
+    car = play.car
+    return FRAME_STRUCT.pack(FRAME, index, episode, step, flags,
+                             car.xpos, car.ypos, car.angle, car.wheel_angle,
+                             *play.state)
+
+
+# address: "host:port" 為 TCP，其他視為 Unix socket 路徑
+def parse_address(address):
+    host, sep, port = address.rpartition(':')
+    if sep and port.isdigit():
+        return host or '127.0.0.1', int(port)
+    return address
+
+
+class SimulationServer():
+    '''
+    playgrounds: 要執行的 Playground
+    e: 訓練時的 epsilon
+    repeat: action repeat 次數
+    queue_size: 每個觀看端最多暫存幾個畫面，滿了就丟掉最舊的
+    yield_every: 每走幾步讓出一次事件迴圈，讓畫面送出去
+    save_every: 每個 Playground 每幾回合存一次 Q-table，停止時也會存
+    Playground 應以 verbose=False, autosave=False 建立，
+    多個 Playground 要各自設定不同的 q_table_path
+    '''
+    def __init__(self, playgrounds, e=0.1, repeat=1, queue_size=64, yield_every=100,
+                 save_every=1000):
+        self.playgrounds = list(playgrounds)
+        self.e = e
+        self.repeat = repeat
+        self.queue_size = queue_size
+        self.yield_every = yield_every
+        self.save_every = save_every
+        self.episodes = [0] * len(self.playgrounds)
+        self.steps = [0] * len(self.playgrounds)
+        self.clients = set()
+        self.running = False
+
+    async def start(self, address):
+        address = parse_address(address)
+        if isinstance(address, tuple):
+            return await asyncio.start_server(self._handle_client, *address)
+        return await asyncio.start_unix_server(self._handle_client, address)
+
+    async def serve(self, address):
+        server = await self.start(address)
+        async with server:
+            await self.run()
+
+    # 全速執行所有 Playground，結束一回合就重設，結束(或被取消)時存檔
+    async def run(self):
+        self.running = True
+        count = 0
+        try:
+            while self.running:
+                for i, play in enumerate(self.playgrounds):
+                    if play.done:
+                        play.reset()
+                        self.episodes[i] += 1
+                        self.steps[i] = 0
+                        if self.episodes[i] % self.save_every == 0:
+                            play.save_q_table()
+                    play.train_step(self.e, self.repeat)
+                    self.steps[i] += 1
+                    if self.clients:
+                        self._broadcast(pack_frame(i, self.episodes[i], self.steps[i], play))
+
+                count += 1
+                if count % self.yield_every == 0:
+                    await asyncio.sleep(0)
+        finally:
+            self.save()
+
+    def stop(self):
+        self.running = False
+
+    def save(self):
+        for play in self.playgrounds:
+            play.save_q_table()
+
+    def _broadcast(self, message):
+        for queue in self.clients:
+            if queue.full():
+                queue.get_nowait()  # 觀看端落後，丟掉最舊的畫面
+            queue.put_nowait(message)
+
+    async def _handle_client(self, reader, writer):
+        queue = asyncio.Queue(self.queue_size)
+        try:
+            for i, play in enumerate(self.playgrounds):
+                writer.write(pack_track(i, play))
+            await writer.drain()
+            self.clients.add(queue)
+            while True:
+                writer.write(await queue.get())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.clients.discard(queue)
+            writer.close()
+
+
+class FrameClient():
+    '''
+    非阻塞的觀看端，給 Animation 的 QTimer 呼叫 poll()
+    tracks: playground id -> (destination line, wall lines)
+    '''
+    def __init__(self, address):
+        address = parse_address(address)
+        if isinstance(address, tuple):
+            self.sock = socket.create_connection(address)
+        else:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.connect(address)
+        self.sock.setblocking(False)
+        self.buffer = b''
+        self.tracks = {}
+
+    # 讀完目前收到的資料，回傳每個 playground 最新的畫面
+    def poll(self):
+        while True:
+            try:
+                data = self.sock.recv(65536)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            self.buffer += data
+
+        latest = {}
+        offset = 0
+        while len(self.buffer) - offset >= TRACK_HEADER.size:
+            if self.buffer[offset] == FRAME:
+                if len(self.buffer) - offset < FRAME_STRUCT.size:
+                    break
+                values = FRAME_STRUCT.unpack_from(self.buffer, offset)
+                flags = values[4]
+                frame = Frame(values[1], values[2], values[3], bool(flags & 1),
+                              bool(flags & 2), *values[5:])
+                latest[frame.playground] = frame
+                offset += FRAME_STRUCT.size
+            else:
+                _, index, n_lines = TRACK_HEADER.unpack_from(self.buffer, offset)
+                size = TRACK_HEADER.size + (n_lines + 1) * 16
+                if len(self.buffer) - offset < size:
+                    break
+                values = struct.unpack_from(f'<{(n_lines + 1) * 4}f', self.buffer,
+                                            offset + TRACK_HEADER.size)
+                lines = [values[k:k+4] for k in range(0, len(values), 4)]
+                self.tracks[index] = (lines[0], lines[1:])
+                offset += size
+        self.buffer = self.buffer[offset:]
+        return latest
+
+    # 等到收到指定 playground 的軌道
+    def wait_track(self, index=0, timeout=5):
+        deadline = time.monotonic() + timeout
+        while index not in self.tracks:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"no track received for playground {index}")
+            self.poll()
+            time.sleep(0.01)
+        return self.tracks[index]
+
+    def close(self):
+        self.sock.close()
+
+
+def view(address, playground=0):
+    from PyQt5 import QtWidgets
+    from simple_playground import Animation
+
+    app = QtWidgets.QApplication([])
+    client = FrameClient(address)
+    client.wait_track(playground)
+    GUI = Animation(None, client, playground=playground)
+    GUI.run()
+    app.exec_()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="本地模擬伺服器")
+    parser.add_argument("address", nargs="?", default="127.0.0.1:8765",
+                        help="host:port 或 Unix socket 路徑")
+    parser.add_argument("--playgrounds", type=int, default=1)
+    parser.add_argument("--track", default=None, help="軌道檔案")
+    parser.add_argument("--e", type=float, default=0.1)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--save-every", type=int, default=1000,
+                        help="每幾回合存一次 Q-table")
+    parser.add_argument("--view", action="store_true", help="以觀看端連到伺服器")
+    parser.add_argument("--playground", type=int, default=0,
+                        help="--view 時要觀看的 playground id")
+    args = parser.parse_args()
+
+    if args.view:
+        view(args.address, args.playground)
+    else:
+        playgrounds = []
+        for i in range(args.playgrounds):
+            play = Playground(track_file=args.track, verbose=False, autosave=False)
+            if args.playgrounds > 1:
+                play.q_table_path = f"q_table_{i}.npy"  # 各自存檔，避免互相覆蓋
+            playgrounds.append(play)
+        server = SimulationServer(playgrounds, e=args.e, repeat=args.repeat,
+                                  save_every=args.save_every)
+        try:
+            asyncio.run(server.serve(args.address))
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,170 @@
+import random as r
+import os
+import time
+import argparse
+import tempfile
+from simple_geometry import *
+
+
+'''
+產生與 軌道座標點.txt 相同格式的走廊軌道:
+    第 1 行: 車子初始位置與角度 (x, y, angle)
+    第 2, 3 行: 終點長方形的兩個對角點
+    第 4 行之後: 牆壁折線上的點，依序相連
+車子從 (0, 0) 朝上(90 度)出發，起點牆在 y = -3，與預設軌道相同。
+'''
+
+# 走廊最小寬度: 要比車子直徑(6)寬，且最短的一段(2 * width)
+# 要比終點離盡頭的距離(13)長，終點才會落在最後一段走廊內
+MIN_WIDTH = 6.5
+
+
+# 走廊中心線: 第一段朝上，之後每個轉角在「朝上」與「朝左/右」之間交替，
+# 因此軌道在 y 方向單調，不會自我相交
+def _centerline(length, corners, width, rng):
+    n_legs = corners + 1
+    min_leg = 2 * width
+    if length < n_legs * min_leg:
+        raise ValueError(
+            f"length must be at least {n_legs * min_leg} for {corners} corners")
+
+    weights = [rng.random() for _ in range(n_legs)]
+    total = sum(weights)
+    extra = length - n_legs * min_leg
+    legs = [min_leg + extra * w / total for w in weights]
+
+    up = Point2D(0, 1)
+    points = [Point2D(0, -3)]
+    directions = []
+    for i, leg in enumerate(legs):
+        if i % 2 == 0:
+            d = up
+        else:
+            d = Point2D(1, 0) if rng.random() < 0.5 else Point2D(-1, 0)
+        directions.append(d)
+        points.append(points[-1] + d*leg)
+    return points, directions
+
+
+# 左側法向量
+def _normal(d):
+    return Point2D(-d.y, d.x)
+
+
+# 把中心線往左(side=1)或往右(side=-1)平移半個走廊寬
+def _offset(points, directions, half, side):
+    normals = [_normal(d) for d in directions]
+    offset = [points[0] + normals[0]*(half*side)]
+    for n1, n2, p in zip(normals[:-1], normals[1:], points[1:-1]):
+        offset.append(p + (n1 + n2)*(half*side))  # 90 度轉角
+    offset.append(points[-1] + normals[-1]*(half*side))
+    return offset
+
+
+# 把每段直牆切成 wall_segments 段
+def _segment(corners, wall_segments):
+    points = [corners[0]]
+    for p1, p2 in zip(corners[:-1], corners[1:]):
+        for k in range(1, wall_segments + 1):
+            points.append(p1 + (p2 - p1)*(k / wall_segments))
+    return points
+
+
+def _fmt(v):
+    s = f"{v:.4f}".rstrip('0').rstrip('.')
+    return "0" if s in ("", "-0") else s
+
+
+def generate_track(length=200, corners=4, wall_segments=1, width=12, seed=None):
+    '''
+    length: 走廊中心線總長
+    corners: 轉角數
+    wall_segments: 每段直牆切成幾段線段
+    width: 走廊寬度
+    seed: 亂數種子，相同種子產生相同軌道
+    回傳軌道檔案的每一行
+    '''
+    if wall_segments < 1:
+        raise ValueError("wall_segments must be at least 1")
+    if width < MIN_WIDTH:
+        raise ValueError(f"width must be at least {MIN_WIDTH}")
+    rng = r.Random(seed)
+    half = width / 2
+    points, directions = _centerline(length, corners, width, rng)
+
+    # 終點: 走廊最後一段，離盡頭 10 ~ 13 的長方形(同預設軌道)
+    end, d = points[-1], directions[-1]
+    n = _normal(d)
+    dp1 = end - d*13 + n*half
+    dp2 = end - d*10 - n*half
+
+    # 牆壁: 左牆從起點走到盡頭，再沿右牆走回起點，形成封閉折線
+    left = _offset(points, directions, half, 1)
+    right = _offset(points, directions, half, -1)
+    wall = _segment(left + right[::-1] + [left[0]], wall_segments)
+
+    lines = ["0,0,90"]
+    lines += [f"{_fmt(p.x)},{_fmt(p.y)}" for p in (dp1, dp2)]
+    lines += [f"{_fmt(p.x)},{_fmt(p.y)}" for p in wall]
+    return lines
+
+
+def write_track(path, **kwargs):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(generate_track(**kwargs)))
+
+
+# 測量不同軌道大小下每秒可以走幾步
+def benchmark(segments=(1, 10, 100, 1000), corners=8, length=400, width=12,
+              steps=2000, repeat=1, seed=0):
+    from simple_playground import Playground
+
+    rng = r.Random(seed)
+    results = []
+    for wall_segments in segments:
+        fd, path = tempfile.mkstemp(suffix=".txt")
+        os.close(fd)
+        try:
+            write_track(path, length=length, corners=corners,
+                        wall_segments=wall_segments, width=width, seed=seed)
+            play = Playground(track_file=path)
+        finally:
+            os.remove(path)
+
+        play.reset()
+        start = time.perf_counter()
+        for _ in range(steps):
+            play.step(play.index_to_angle(rng.randrange(play.n_actions)), repeat)
+            if play.done:
+                play.reset()
+        elapsed = time.perf_counter() - start
+        results.append((len(play.lines), steps / elapsed))
+        print(f"{len(play.lines):>8} segments: {steps / elapsed:10.1f} steps/sec")
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="產生走廊軌道或測試模擬速度")
+    parser.add_argument("output", nargs="?", default="generated_track.txt")
+    parser.add_argument("--length", type=float, default=200)
+    parser.add_argument("--corners", type=int, default=4)
+    parser.add_argument("--segments", type=int, nargs="+", default=[1],
+                        help="每段直牆切成幾段，--benchmark 時可給多個")
+    parser.add_argument("--width", type=float, default=12)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--benchmark", action="store_true",
+                        help="測試不同牆壁段數下的 steps/sec")
+    parser.add_argument("--steps", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="action repeat 次數")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(segments=args.segments, corners=args.corners, length=args.length,
+                  width=args.width, steps=args.steps, repeat=args.repeat,
+                  seed=args.seed or 0)
+    else:
+        if len(args.segments) > 1:
+            parser.error("only one --segments value can be used when writing a track")
+        write_track(args.output, length=args.length, corners=args.corners,
+                    wall_segments=args.segments[0], width=args.width, seed=args.seed)
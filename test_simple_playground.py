@@ -0,0 +1,214 @@
+import pytest
+import numpy as np
+
+pytest.importorskip("PyQt5")
+pytest.importorskip("matplotlib")
+
+import random
+
+from simple_playground import (FAR_DIST, MIDDLE_DIST, SIDE_DIFF, GreedyPolicy,
+                               Playground)
+
+
+# 模擬一回合: 同一格 (middle_center, 0 度) 連續出現 n 次，最後撞牆
+def fill_episode(play, n=60):
+    state = play.state_index["middle_center"]
+    play.episode_states[:n] = state
+    play.episode_actions[:n] = play.angle_to_index(0)
+    play.episode_next_states[:n] = state
+    play.episode_rewards[:n] = -0.08
+    play.episode_rewards[n - 1] = -1
+    play.episode_length = n
+    return state
+
+
+def discounted_returns(rewards, gamma):
+    returns, g = [], 0.0
+    for reward in reversed(rewards):
+        g = reward + gamma * g
+        returns.append(g)
+    return returns[::-1]
+
+
+@pytest.mark.parametrize("alpha", [0.1, 0.5, 1.0])
+def test_mc_backup_stays_within_returns(alpha):
+    play = Playground(update_mode="mc", alpha=alpha)
+    fill_episode(play)
+    returns = discounted_returns(list(play.episode_rewards[:60]), play.gamma)
+
+    play.episode_backup()
+
+    q = play.q_table["middle_center"][play.angle_to_index(0)]
+    assert min(returns + [0]) <= q <= max(returns + [0])
+    if alpha == 1.0:
+        assert q == pytest.approx(np.mean(returns))
+
+
+class ScriptedPlayground(Playground):
+    '''感測器數值與 reward 依照 script 走，用來測試已知的軌跡'''
+    def __init__(self, script, rewards, **kwargs):
+        self.script = script
+        self.rewards = rewards
+        self.t = 0
+        super().__init__(**kwargs)
+
+    @property
+    def state(self):
+        return self.script[self.t]
+
+    def step(self, action=None, repeat=1):
+        self.t += 1
+        self.done = self.t == len(self.script) - 1
+        return self.state
+
+    def reward(self, q_state, angle):
+        return self.rewards[self.t - 1]
+
+
+# far_center -> middle_center -> close_center -> 撞牆
+SCRIPT = [[20, 10, 10], [7, 10, 10], [3, 10, 10], [3, 10, 10]]
+REWARDS = [-0.01, -0.08, -1]
+
+
+def scripted_playground(update_mode):
+    play = ScriptedPlayground(SCRIPT, REWARDS, update_mode=update_mode, alpha=1.0,
+                              verbose=False, autosave=False)
+    play.q_table["far_center"][3] = 0.5
+    play.q_table["middle_center"][4] = 0.8
+    play.q_table["close_center"][2] = 0.3
+    return play
+
+
+@pytest.mark.parametrize("update_mode, trace", [("lambda", 0.8), ("mc", 1.0)])
+def test_train_step_backs_up_exact_lambda_return(update_mode, trace):
+    play = scripted_playground(update_mode)
+    gamma = play.gamma
+
+    while not play.done:
+        play.train_step(0)
+
+    # G_t = r_t + gamma * ((1 - lambda) * max Q(s_{t+1}) + lambda * G_{t+1})
+    g2 = -1
+    g1 = -0.08 + gamma * ((1 - trace) * 0.3 + trace * g2)
+    g0 = -0.01 + gamma * ((1 - trace) * 0.8 + trace * g1)
+    assert play.episode_length == 0  # 回合結束時已自動更新
+    assert play.q_table["far_center"][3] == pytest.approx(g0)
+    assert play.q_table["middle_center"][4] == pytest.approx(g1)
+    assert play.q_table["close_center"][2] == pytest.approx(g2)
+
+
+def test_td_mode_uses_alpha_and_gamma():
+    play = scripted_playground("td")
+    play.alpha, play.gamma = 0.5, 0.9
+
+    while not play.done:
+        play.train_step(0)
+
+    # td 只在最後一步更新: Q += alpha * (r + gamma * max Q(s') - Q)
+    q = play.q_table["close_center"][2]
+    assert q == pytest.approx(0.3 + 0.5 * (-1 + 0.9 * 0.3 - 0.3))
+
+
+def test_step_rejects_non_positive_repeat():
+    play = Playground()
+    with pytest.raises(ValueError):
+        play.step(0, repeat=0)
+
+
+def snapshot(play):
+    car = play.car
+    return (car.xpos, car.ypos, car.angle, car.wheel_angle,
+            play.done, play.complete, play.state)
+
+
+# 同一個動作 step(a, repeat=k) 與連續 k 次 step(a) 的結果要完全相同，
+# 回傳回合是否在某次 repeat 的中途結束
+def compare_repeat(seed, repeat=3):
+    actions = [15, -15, 30, -30, 10, -10]
+    batched, single = Playground(), Playground()
+    batched.reset(random.Random(seed))
+    single.reset(random.Random(seed))
+
+    ended_mid_repeat = False
+    for i in range(200):
+        action = actions[i % len(actions)]
+        batched.step(action, repeat)
+        for k in range(repeat):
+            single.step(action)
+            if single.done and k < repeat - 1:
+                ended_mid_repeat = True
+        assert snapshot(batched) == snapshot(single)
+        if batched.done:
+            break
+    assert batched.done
+    return ended_mid_repeat
+
+
+def test_step_repeat_matches_repeated_single_steps():
+    ended_mid_repeat = [compare_repeat(seed) for seed in range(20)]
+    assert any(ended_mid_repeat)
+
+
+def test_explicit_track_file_errors_are_raised(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        Playground(track_file=str(tmp_path / "missing.txt"))
+
+
+def trained_policy():
+    play = Playground()
+    for i, key in enumerate(play.q_table):
+        play.q_table[key][i % play.n_actions] = 1
+    return GreedyPolicy(play.q_table, seed=0)
+
+
+def test_rollout_is_reproducible_and_leaves_global_rng_alone():
+    policy = trained_policy()
+    play = Playground()
+    random.seed(123)
+    before = random.getstate()
+
+    first = [policy.rollout(play, seed=s) for s in range(5)]
+    second = [policy.rollout(play, seed=s) for s in range(5)]
+
+    assert first == second
+    assert random.getstate() == before
+
+
+def test_rollout_batch_matches_single_rollouts():
+    policy = trained_policy()
+    plays = [Playground() for _ in range(4)]
+
+    batch = policy.rollout_batch(plays, seed=10)
+
+    assert batch == [policy.rollout(Playground(), seed=10 + i) for i in range(4)]
+
+
+@pytest.mark.parametrize("update_mode", Playground.update_modes)
+def test_quiet_training_does_not_print_or_save(update_mode, tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    play = Playground(update_mode=update_mode, verbose=False, autosave=False)
+
+    play.ql_train(20, 0.9)
+
+    assert capsys.readouterr().out == ""
+    assert list(tmp_path.iterdir()) == []
+
+
+# 前方距離與左右差都取在分界上與分界兩側
+FRONTS = [0, MIDDLE_DIST - 0.01, MIDDLE_DIST, FAR_DIST - 0.01, FAR_DIST, 30]
+SIDE_DIFFS = [-10, -SIDE_DIFF - 0.01, -SIDE_DIFF, 0, SIDE_DIFF, SIDE_DIFF + 0.01, 10]
+
+
+def test_policy_matches_q_table_argmax_at_cutoffs():
+    play = Playground()
+    rng = np.random.default_rng(0)
+    for key in play.q_table:
+        play.q_table[key] = rng.permutation(play.n_actions).astype(float)
+    policy = GreedyPolicy(play.q_table)
+
+    states = [[f, 10 + d, 10] for f in FRONTS for d in SIDE_DIFFS]
+    expected = [play.index_to_angle(int(np.argmax(play.q_table[play.q_table_state(s)])))
+                for s in states]
+
+    assert [policy(s) for s in states] == expected
+    assert policy.act_batch(states).tolist() == expected
@@ -0,0 +1,119 @@
+import asyncio
+import os
+import socket
+import tempfile
+
+import pytest
+
+pytest.importorskip("PyQt5")
+pytest.importorskip("matplotlib")
+
+from simple_playground import Playground
+from simple_server import (FRAME_STRUCT, FrameClient, SimulationServer, pack_frame,
+                           pack_track, parse_address)
+
+
+@pytest.fixture
+def socket_path():
+    # Unix socket 路徑長度有限制，用短的暫存目錄
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "sim.sock")
+    yield path
+    if os.path.exists(path):
+        os.remove(path)
+    os.rmdir(directory)
+
+
+def quiet_playground(tmp_path, name="q_table.npy"):
+    play = Playground(verbose=False, autosave=False)
+    play.q_table_path = str(tmp_path / name)
+    return play
+
+
+@pytest.mark.parametrize("address, expected", [
+    ("127.0.0.1:8765", ("127.0.0.1", 8765)),
+    ("localhost:1", ("localhost", 1)),
+    (":9000", ("127.0.0.1", 9000)),
+    ("/tmp/sim.sock", "/tmp/sim.sock"),
+    ("sim.sock", "sim.sock"),
+])
+def test_parse_address(address, expected):
+    assert parse_address(address) == expected
+
+
+@pytest.mark.parametrize("split", [1, 5, 40, -3])
+def test_frame_client_round_trip_with_split_buffer(split, socket_path, tmp_path):
+    play = quiet_playground(tmp_path)
+    data = pack_track(0, play) + pack_frame(0, 3, 7, play)
+
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(socket_path)
+    listener.listen(1)
+    client = FrameClient(socket_path)
+    conn, _ = listener.accept()
+    try:
+        conn.sendall(data[:split])
+        assert client.poll() == {}
+        conn.sendall(data[split:])
+        frames = client.poll()
+    finally:
+        client.close()
+        conn.close()
+        listener.close()
+
+    destination, walls = client.tracks[0]
+    assert len(walls) == len(play.lines)
+    for values, line in zip([destination] + walls, [play.destination_line] + play.lines):
+        assert values == pytest.approx((line.p1.x, line.p1.y, line.p2.x, line.p2.y))
+
+    frame = frames[0]
+    assert (frame.playground, frame.episode, frame.step) == (0, 3, 7)
+    assert (frame.done, frame.complete) == (play.done, play.complete)
+    assert (frame.x, frame.y, frame.angle) == pytest.approx(
+        (play.car.xpos, play.car.ypos, play.car.angle), rel=1e-6)
+    assert [frame.front, frame.right, frame.left] == pytest.approx(play.state, rel=1e-6)
+    assert client.buffer == b''
+
+
+def test_broadcast_drops_oldest_frame_when_queue_is_full(tmp_path):
+    server = SimulationServer([quiet_playground(tmp_path)], queue_size=2)
+    slow, fast = asyncio.Queue(2), asyncio.Queue(4)
+    server.clients.update([slow, fast])
+
+    for message in (b'1', b'2', b'3'):
+        server._broadcast(message)
+
+    assert [slow.get_nowait() for _ in range(slow.qsize())] == [b'2', b'3']
+    assert [fast.get_nowait() for _ in range(fast.qsize())] == [b'1', b'2', b'3']
+
+
+def test_server_streams_tracks_and_frames(socket_path, tmp_path):
+    plays = [quiet_playground(tmp_path, f"q_table_{i}.npy") for i in range(2)]
+
+    async def main():
+        server = SimulationServer(plays, yield_every=10)
+        listener = await server.start(socket_path)
+        task = asyncio.create_task(server.run())
+        client = FrameClient(socket_path)
+        try:
+            await asyncio.to_thread(client.wait_track, 1)
+            frames = {}
+            for _ in range(200):
+                frames.update(client.poll())
+                if len(frames) == 2:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            client.close()
+            server.stop()
+            await task
+            listener.close()
+        return client.tracks, frames
+
+    tracks, frames = asyncio.run(main())
+
+    assert sorted(tracks) == [0, 1]
+    assert len(tracks[0][1]) == len(plays[0].lines)
+    assert sorted(frames) == [0, 1]
+    # 停止時每個 Playground 都會存到自己的檔案
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["q_table_0.npy", "q_table_1.npy"]
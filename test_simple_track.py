@@ -0,0 +1,61 @@
+import pytest
+
+from simple_track import MIN_WIDTH, generate_track, write_track
+
+
+def parse(lines):
+    return [tuple(float(v) for v in line.split(',')) for line in lines]
+
+
+def test_same_seed_gives_same_track():
+    assert generate_track(seed=7) == generate_track(seed=7)
+    assert generate_track(seed=7) != generate_track(seed=8)
+
+
+@pytest.mark.parametrize("corners, wall_segments", [(0, 1), (3, 2), (4, 5)])
+def test_wall_is_closed_with_expected_segment_count(corners, wall_segments):
+    lines = generate_track(length=400, corners=corners, wall_segments=wall_segments,
+                           seed=1)
+    wall = parse(lines[3:])
+    assert wall[0] == wall[-1]
+    assert len(wall) - 1 == (2 * (corners + 1) + 2) * wall_segments
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("corners", [0, 1, 4, 7])
+@pytest.mark.parametrize("width", [MIN_WIDTH, 12, 20])
+def test_destination_lies_inside_last_leg(seed, corners, width):
+    lines = generate_track(length=60 * (corners + 1), corners=corners, width=width,
+                           seed=seed)
+    dp1, dp2 = parse(lines[1:3])
+    # 牆角: 左牆 corners + 2 個點，接著右牆反向 corners + 2 個點
+    wall = parse(lines[3:])
+    left_end, right_end = wall[corners + 1], wall[corners + 2]
+    left_prev, right_prev = wall[corners], wall[corners + 3]
+    # 最後一段走廊: 從上一個轉角的中心線到盡頭的長方形
+    corner = ((left_prev[0] + right_prev[0]) / 2, (left_prev[1] + right_prev[1]) / 2)
+    xs = [left_end[0], right_end[0], corner[0]]
+    ys = [left_end[1], right_end[1], corner[1]]
+    for x, y in (dp1, dp2):
+        assert min(xs) - 1e-3 <= x <= max(xs) + 1e-3
+        assert min(ys) - 1e-3 <= y <= max(ys) + 1e-3
+
+
+@pytest.mark.parametrize("width", [5, 6, 6.4])
+def test_narrow_width_is_rejected(width):
+    with pytest.raises(ValueError):
+        generate_track(width=width)
+
+
+def test_loaded_track_starts_at_origin_facing_up(tmp_path):
+    pytest.importorskip("PyQt5")
+    pytest.importorskip("matplotlib")
+    from simple_playground import Playground
+
+    path = tmp_path / "track.txt"
+    write_track(str(path), corners=4, wall_segments=3, seed=2)
+    play = Playground(track_file=str(path))
+
+    assert (play.car.xpos, play.car.ypos, play.car.angle) == (0, 0, 90)
+    assert play.done is False
+    assert len(play.lines) == (2 * 5 + 2) * 3